@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import sys
 
 from tester_agent.config import build_config, parse_args
 from tester_agent.runner import RegistrationTestRunner
+from tester_agent.serialization import dumps
 
 
 async def async_main() -> int:
@@ -12,7 +13,9 @@ async def async_main() -> int:
     config = build_config(args)
     runner = RegistrationTestRunner(config)
     report = await runner.run()
-    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(dumps(report, indent=True) + b"\n")
+    sys.stdout.buffer.flush()
     return 0 if report.get("status") == "success" else 1
 
 
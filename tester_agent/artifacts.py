@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+
+class ArtifactWriter:
+    """Writes artifact files from a background task so disk I/O stays off the attempt loop."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[tuple[Path, bytes]] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> ArtifactWriter:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def write(self, path: Path, data: bytes) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._queue.put_nowait((path, data))
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            path, data = await self._queue.get()
+            try:
+                await asyncio.to_thread(write_file, path, data)
+            except Exception as exc:  # noqa: BLE001
+                print(f"Failed to write artifact {path}: {exc}")
+            finally:
+                self._queue.task_done()
+
+
+def write_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
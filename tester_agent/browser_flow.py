@@ -1,42 +1,147 @@
 from __future__ import annotations
 
-import os
+import asyncio
 import re
+import secrets
+import string
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Any
-from uuid import uuid4
 
-from faker import Faker
-from playwright.async_api import Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Browser, BrowserContext, Error as PlaywrightError, Locator, Page, Playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
+from tester_agent.artifacts import ArtifactWriter
+from tester_agent.browser_pool import BrowserPool
 from tester_agent.config import AgentConfig
 
+GEN_IMAGE_RE = re.compile(r"^Generate Image$", re.IGNORECASE)
+GEN_VIDEO_RE = re.compile(r"^Generate Video$", re.IGNORECASE)
+REGISTRATION_RE = re.compile(r"^Registration$", re.IGNORECASE)
+GENERATE_URL_RE = re.compile(r".*/en/generate.*")
+REGISTER_URL_RE = re.compile(r".*/en/user/register.*")
+
+PASSWORD_CHARSETS = (string.ascii_lowercase, string.ascii_uppercase, string.digits, "!@#$%^&*")
+PASSWORD_ALPHABET = "".join(PASSWORD_CHARSETS)
+_SYSTEM_RANDOM = secrets.SystemRandom()
+
 
 class BrowserRegistrationFlow:
-    def __init__(self, config: AgentConfig):
+    LAUNCH_ARGS = ["--disable-dev-shm-usage", "--no-sandbox", "--disable-gpu"]
+    COMBINED = "div.model-select.dropdown"
+    MENU = ".dropdown-menu"
+    ITEMS_FALLBACK = "li, a, button, div"
+    GENERATE_BUTTON = "button#generateButton"
+    DASHBOARD_PROBE_JS = """
+        (sel) => {
+            const container = document.querySelector(sel.combined);
+            const menus = container ? container.querySelectorAll(sel.menu) : [];
+            const firstMenu = menus[0];
+            const items = firstMenu
+                ? (firstMenu.children.length || firstMenu.querySelectorAll(sel.itemsFallback).length)
+                : 0;
+            return {
+                model: container !== null,
+                menuCount: menus.length,
+                itemCount: items,
+                gen: document.querySelector(sel.generateButton) !== null,
+            };
+        }
+    """
+    DASHBOARD_READY_JS = f"""
+        (sel) => {{
+            const probe = ({DASHBOARD_PROBE_JS})(sel);
+            return probe.model && probe.menuCount > 0 && probe.itemCount >= 2 && probe.gen;
+        }}
+    """
+
+    FILL_FORM_JS = """
+        (fields) => {
+            const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+            for (const [selector, value] of fields) {
+                const el = document.querySelector(selector);
+                if (!(el instanceof HTMLInputElement)) {
+                    throw new Error(`Input not found: ${selector}`);
+                }
+                el.focus();
+                setValue.call(el, value);
+                el.dispatchEvent(new Event("input", { bubbles: true }));
+                el.dispatchEvent(new Event("change", { bubbles: true }));
+            }
+        }
+    """
+
+    def __init__(self, config: AgentConfig, writer: ArtifactWriter | None = None):
         self.config = config
-        self.fake = Faker(config.locale)
+        self._owns_writer = writer is None
+        self.writer = writer or ArtifactWriter()
         self.video_dir = Path(config.video_dir)
         self.artifact_dir = Path(config.artifact_dir)
-        self.video_dir.mkdir(parents=True, exist_ok=True)
-        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        if config.record_video:
+            self.video_dir.mkdir(parents=True, exist_ok=True)
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._pool: BrowserPool | None = None
+
+    async def __aenter__(self) -> BrowserRegistrationFlow:
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.config.headless,
+                args=self.LAUNCH_ARGS,
+            )
+            self._pool = BrowserPool(
+                self._browser,
+                self._new_context,
+                size=min(self.config.parallel_attempts, self.config.max_retries),
+                max_uses=self.config.context_max_uses,
+            )
+            await self._pool.open()
+        except Exception:
+            await self.__aexit__(None, None, None)
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        if self._owns_writer:
+            await self.writer.close()
 
     def generate_user_data(self) -> dict[str, str]:
         return {
-            "name": self.fake.name(),
-            "email": f"test+{uuid4().hex[:10]}@example.com",
-            "password": self.fake.password(length=14, special_chars=True, digits=True, upper_case=True, lower_case=True),
+            "name": self._fake_name(),
+            "email": f"test+{secrets.token_hex(5)}@example.com",
+            "password": _generate_password(),
         }
 
-    def register_url(self) -> str:
-        return f"{self.config.base_url.rstrip('/')}{self.config.register_path}"
+    @cached_property
+    def fake(self) -> Any | None:
+        try:
+            from faker import Faker
+        except ImportError:  # pragma: no cover
+            return None
+        return Faker(self.config.locale)
+
+    def _fake_name(self) -> str:
+        if self.fake is None:
+            return f"Test User {secrets.token_hex(3)}"
+        return self.fake.name()
 
     async def run_attempt(self, test_id: str, attempt: int, user_data: dict[str, str]) -> dict[str, Any]:
         attempt_prefix = f"{test_id}_attempt{attempt}"
+        # Screenshots/traces create their parent directory on write,
+        # so the attempt directory only appears when there is something to save.
         attempt_dir = self.artifact_dir / attempt_prefix
-        attempt_dir.mkdir(parents=True, exist_ok=True)
 
         result: dict[str, Any] = {
             "attempt": attempt,
@@ -44,79 +149,106 @@ class BrowserRegistrationFlow:
             "user_data": {"email": user_data["email"], "name": user_data["name"]},
             "success": False,
             "reason": None,
-            "video_path": None,
+            "trace_path": None,
             "dashboard_checks": {},
         }
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.config.headless)
-            context = await self._new_context(browser)
+        if self._pool is None:
+            raise RuntimeError("Browser is not started; use `async with BrowserRegistrationFlow(...)`.")
+
+        try:
+            context = await self._pool.acquire()
+        except Exception as exc:  # noqa: BLE001
+            result["reason"] = f"Unhandled error: cannot open browser context: {exc}"
+            return result
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True, sources=False)
             page = await context.new_page()
-            page.set_default_timeout(self.config.timeout_ms)
-            page.set_default_navigation_timeout(self.config.timeout_ms)
-            recorded_video = page.video
+        except Exception as exc:  # noqa: BLE001
+            await self._pool.release(context)
+            result["reason"] = f"Unhandled error: cannot open page: {exc}"
+            return result
+        except BaseException:
+            await self._pool.release(context)
+            raise
+        page.set_default_timeout(self.config.timeout_ms)
+        page.set_default_navigation_timeout(self.config.timeout_ms)
+        recorded_video = page.video
+
+        try:
+            await self._open_registration_via_home(page)
+            await self._fill_form(page, user_data)
+
+            await page.locator('button[type="submit"]').first.click()
+            await page.wait_for_load_state("domcontentloaded")
+            await self._wait_for_submit_outcome(page)
+
+            current_url = page.url
+            is_dashboard_url = bool(self.config.dashboard_url_re.search(current_url))
+            if is_dashboard_url:
+                await self._wait_for_dashboard(page)
+            dashboard_checks = await self.verify_dashboard(page)
+
+            success = is_dashboard_url and dashboard_checks.get("ok", False)
+            result["success"] = success
+            result["final_url"] = current_url
+            result["dashboard_checks"] = dashboard_checks
+
+            if not is_dashboard_url:
+                error_text = await self._safe_text(page, self.config.selectors.error)
+                result["reason"] = error_text or "Registration did not redirect to dashboard URL."
+            elif not dashboard_checks.get("ok", False):
+                result["reason"] = dashboard_checks.get("reason", "Dashboard checks failed.")
 
+            if not success:
+                await self._screenshot(page, attempt_dir / "error.jpg")
+            elif self.config.screenshot_on_success:
+                await self._screenshot(page, attempt_dir / "after_submit.jpg")
+
+        except PlaywrightTimeoutError as exc:
+            await self._screenshot(page, attempt_dir / "error.jpg")
+            result["reason"] = f"Timeout: {exc}"
+        except Exception as exc:  # noqa: BLE001
+            await self._screenshot(page, attempt_dir / "error.jpg")
+            result["reason"] = f"Unhandled error: {exc}"
+        finally:
             try:
-                await self._open_registration_via_home(page)
-                await page.fill(self.config.selectors.email, user_data["email"])
-                await page.fill(self.config.selectors.password, user_data["password"])
-                await page.fill(self.config.selectors.name, user_data["name"])
-                await page.screenshot(path=str(attempt_dir / "before_submit.png"))
-
-                await page.locator('button[type="submit"]').first.click()
-                await page.wait_for_load_state("networkidle")
-                await page.wait_for_timeout(1500)
-                await page.screenshot(path=str(attempt_dir / "after_submit.png"))
-
-                current_url = page.url
-                is_dashboard_url = bool(re.search(self.config.dashboard_url_pattern, current_url))
-                dashboard_checks = await self.verify_dashboard(page)
-
-                success = is_dashboard_url and dashboard_checks.get("ok", False)
-                result["success"] = success
-                result["final_url"] = current_url
-                result["dashboard_checks"] = dashboard_checks
-
-                if not is_dashboard_url:
-                    error_text = await self._safe_text(page, self.config.selectors.error)
-                    result["reason"] = error_text or "Registration did not redirect to dashboard URL."
-                elif not dashboard_checks.get("ok", False):
-                    result["reason"] = dashboard_checks.get("reason", "Dashboard checks failed.")
-
-            except PlaywrightTimeoutError as exc:
-                await page.screenshot(path=str(attempt_dir / "error.png"))
-                result["reason"] = f"Timeout: {exc}"
-            except Exception as exc:  # noqa: BLE001
-                await page.screenshot(path=str(attempt_dir / "error.png"))
-                result["reason"] = f"Unhandled error: {exc}"
+                await self._stop_tracing(context, result, attempt_dir / "trace.zip")
+                try:
+                    await page.close()
+                except PlaywrightError:
+                    pass
             finally:
-                await context.close()
-                await browser.close()
-                if recorded_video:
-                    raw_path = await recorded_video.path()
-                    finalized = self.video_dir / f"{attempt_prefix}.webm"
-                    os.replace(raw_path, finalized)
+                await self._pool.release(context)
+            if recorded_video:
+                finalized = self.video_dir / f"{attempt_prefix}.webm"
+                try:
+                    await recorded_video.save_as(finalized)
+                    await recorded_video.delete()
                     result["video_path"] = str(finalized)
+                except (PlaywrightError, OSError) as exc:
+                    result["video_error"] = str(exc)
 
         return result
 
+    @staticmethod
+    async def _stop_tracing(context: BrowserContext, result: dict[str, Any], trace_path: Path) -> None:
+        # A crashed page/context or an unwritable trace must not replace the attempt's own result.
+        try:
+            if result["success"]:
+                await context.tracing.stop()
+            else:
+                await context.tracing.stop(path=str(trace_path))
+                result["trace_path"] = str(trace_path)
+        except (PlaywrightError, OSError) as exc:
+            result["trace_error"] = str(exc)
+
     async def verify_dashboard(self, page: Page) -> dict[str, Any]:
-        combined_selector = "div.model-select.dropdown"
-        exists_model_dropdown = await page.locator(combined_selector).count() > 0
-        generate_button_exists = await page.locator("button#generateButton").count() > 0
-
-        dropdown_menu_count = 0
-        dropdown_item_count = 0
-        if exists_model_dropdown:
-            container = page.locator(combined_selector).first
-            dropdown_menu = container.locator(".dropdown-menu")
-            dropdown_menu_count = await dropdown_menu.count()
-            if dropdown_menu_count > 0:
-                first_menu = dropdown_menu.first
-                direct_children = await first_menu.locator(":scope > *").count()
-                if direct_children == 0:
-                    direct_children = await first_menu.locator("li, a, button, div").count()
-                dropdown_item_count = direct_children
+        probe = await page.evaluate(self.DASHBOARD_PROBE_JS, self._dashboard_selectors())
+        exists_model_dropdown = bool(probe.get("model"))
+        generate_button_exists = bool(probe.get("gen"))
+        dropdown_menu_count = int(probe.get("menuCount", 0))
+        dropdown_item_count = int(probe.get("itemCount", 0))
 
         ok = (
             exists_model_dropdown
@@ -153,56 +285,108 @@ class BrowserRegistrationFlow:
             "generate_button_exists": generate_button_exists,
         }
 
+    async def _wait_for_submit_outcome(self, page: Page) -> None:
+        # Stop at whichever comes first: redirect to the dashboard or a visible form error.
+        # Neither outcome within the timeout falls through to the usual diagnostics.
+        pending = {
+            asyncio.create_task(page.wait_for_url(self.config.dashboard_url_re, timeout=self.config.timeout_ms)),
+            asyncio.create_task(
+                page.locator(self.config.selectors.error).first.wait_for(state="visible", timeout=self.config.timeout_ms)
+            ),
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(task.exception() is None for task in done):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _wait_for_dashboard(self, page: Page) -> None:
+        # The SPA renders the model dropdown and generate button after load; give it
+        # until the timeout, then let verify_dashboard report whatever is missing.
+        try:
+            await page.wait_for_function(
+                self.DASHBOARD_READY_JS,
+                arg=self._dashboard_selectors(),
+                timeout=self.config.timeout_ms,
+            )
+        except PlaywrightTimeoutError:
+            pass
+
+    def _dashboard_selectors(self) -> dict[str, str]:
+        return {
+            "combined": self.COMBINED,
+            "menu": self.MENU,
+            "itemsFallback": self.ITEMS_FALLBACK,
+            "generateButton": self.GENERATE_BUTTON,
+        }
+
     async def _new_context(self, browser: Browser) -> BrowserContext:
-        return await browser.new_context(
-            viewport={"width": 1366, "height": 768},
-            record_video_dir=str(self.video_dir),
-            record_video_size={"width": 1366, "height": 768},
-        )
+        options: dict[str, Any] = {"viewport": {"width": 1366, "height": 768}}
+        if self.config.record_video:
+            options["record_video_dir"] = str(self.video_dir)
+            options["record_video_size"] = {"width": 1366, "height": 768}
+        return await browser.new_context(**options)
+
+    async def _fill_form(self, page: Page, user_data: dict[str, str]) -> None:
+        fields = [
+            (self.config.selectors.email, user_data["email"]),
+            (self.config.selectors.password, user_data["password"]),
+            (self.config.selectors.name, user_data["name"]),
+        ]
+        try:
+            await page.evaluate(self.FILL_FORM_JS, fields)
+        except PlaywrightError:
+            for selector, value in fields:
+                await page.fill(selector, value)
 
     async def _open_registration_via_home(self, page: Page) -> None:
-        await page.goto(self.config.base_url.rstrip("/"), wait_until="domcontentloaded")
-
-        clicked_generate = await self._click_first_existing(
-            page,
-            [
-                page.get_by_role("button", name=re.compile(r"^Generate Image$", re.IGNORECASE)),
-                page.get_by_role("link", name=re.compile(r"^Generate Image$", re.IGNORECASE)),
-                page.get_by_role("button", name=re.compile(r"^Generate Video$", re.IGNORECASE)),
-                page.get_by_role("link", name=re.compile(r"^Generate Video$", re.IGNORECASE)),
-                page.locator("text=Generate Image"),
-                page.locator("text=Generate Video"),
-            ],
+        await page.goto(self.config.base_url, wait_until="domcontentloaded")
+
+        await self._click_preferred(
+            page.get_by_role("button", name=GEN_IMAGE_RE)
+            .or_(page.get_by_role("link", name=GEN_IMAGE_RE))
+            .or_(page.get_by_role("button", name=GEN_VIDEO_RE))
+            .or_(page.get_by_role("link", name=GEN_VIDEO_RE)),
+            [page.locator("text=Generate Image"), page.locator("text=Generate Video")],
+            "Cannot find 'Generate Image' or 'Generate Video' on landing page.",
         )
-        if not clicked_generate:
-            raise RuntimeError("Cannot find 'Generate Image' or 'Generate Video' on landing page.")
 
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_url(re.compile(r".*/en/generate.*"), timeout=self.config.timeout_ms)
-
-        clicked_registration = await self._click_first_existing(
-            page,
-            [
-                page.get_by_role("link", name=re.compile(r"^Registration$", re.IGNORECASE)),
-                page.locator("a:has-text('Registration')"),
-                page.locator("text=Registration"),
-            ],
+        await page.wait_for_url(GENERATE_URL_RE, timeout=self.config.timeout_ms)
+
+        await self._click_preferred(
+            page.get_by_role("link", name=REGISTRATION_RE).or_(page.locator("a:has-text('Registration')")),
+            [page.locator("text=Registration")],
+            "Cannot find 'Registration' link on login screen.",
         )
-        if not clicked_registration:
-            raise RuntimeError("Cannot find 'Registration' link on login screen.")
 
         await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_url(re.compile(r".*/en/user/register.*"), timeout=self.config.timeout_ms)
+        await page.wait_for_url(REGISTER_URL_RE, timeout=self.config.timeout_ms)
 
-    async def _click_first_existing(self, page: Page, candidates: list[Any]) -> bool:
-        for locator in candidates:
-            try:
-                if await locator.count() > 0:
-                    await locator.first.click()
-                    return True
-            except Exception:
-                continue
-        return False
+    async def _click_preferred(self, preferred: Locator, fallbacks: list[Locator], error_message: str) -> None:
+        # `or_` resolves in DOM order, so a loose text match could beat the real button/link.
+        # Wait once for any candidate, then click by priority: role-based first, then text fallbacks.
+        any_candidate = preferred
+        for locator in fallbacks:
+            any_candidate = any_candidate.or_(locator)
+        try:
+            await any_candidate.first.wait_for(timeout=self.config.timeout_ms)
+        except PlaywrightTimeoutError as exc:
+            raise RuntimeError(error_message) from exc
+
+        for locator in [preferred, *fallbacks]:
+            if await locator.count() > 0:
+                await locator.first.click()
+                return
+        raise RuntimeError(error_message)
+
+    async def _screenshot(self, page: Page, path: Path) -> None:
+        image = await page.screenshot(type="jpeg", quality=60, full_page=False)
+        self.writer.write(path, image)
 
     @staticmethod
     async def _safe_text(page: Page, selector: str) -> str | None:
@@ -211,3 +395,10 @@ class BrowserRegistrationFlow:
             return None
         text = await locator.text_content()
         return text.strip() if text else None
+
+
+def _generate_password(length: int = 14) -> str:
+    chars = [secrets.choice(charset) for charset in PASSWORD_CHARSETS]
+    chars += [secrets.choice(PASSWORD_ALPHABET) for _ in range(length - len(chars))]
+    _SYSTEM_RANDOM.shuffle(chars)
+    return "".join(chars)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from playwright.async_api import Browser, BrowserContext
+
+
+@dataclass
+class _PooledContext:
+    context: BrowserContext
+    uses: int = 0
+
+
+class BrowserPool:
+    """Bounded pool of pre-created browser contexts shared by registration attempts.
+
+    With the default `max_uses=1` every attempt gets a fresh context. Higher values reuse a
+    context across attempts and only clear its cookies, so other storage carries over.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        new_context: Callable[[Browser], Awaitable[BrowserContext]],
+        size: int = 1,
+        max_uses: int = 1,
+    ):
+        self.browser = browser
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._new_context = new_context
+        self._entries: dict[BrowserContext, _PooledContext] = {}
+        self._available: asyncio.Queue[_PooledContext] = asyncio.Queue()
+
+    async def open(self) -> None:
+        contexts = await asyncio.gather(*(self._new_context(self.browser) for _ in range(self.size)))
+        for context in contexts:
+            self._add(context)
+
+    async def close(self) -> None:
+        entries = list(self._entries.values())
+        self._entries.clear()
+        self._available = asyncio.Queue()
+        await asyncio.gather(*(entry.context.close() for entry in entries), return_exceptions=True)
+
+    async def acquire(self) -> BrowserContext:
+        if not self._entries:
+            # Every replacement context failed to start; try once more so the caller gets the error.
+            self._add(await self._new_context(self.browser))
+        entry = await self._available.get()
+        return entry.context
+
+    async def release(self, context: BrowserContext) -> None:
+        entry = self._entries.get(context)
+        if entry is None:
+            return
+        entry.uses += 1
+
+        recycle = entry.uses >= self.max_uses
+        if not recycle:
+            try:
+                await context.clear_cookies()
+            except Exception:  # noqa: BLE001
+                recycle = True
+
+        if not recycle:
+            self._available.put_nowait(entry)
+            return
+
+        del self._entries[context]
+        try:
+            await context.close()
+        except Exception:  # noqa: BLE001
+            pass
+        try:
+            self._add(await self._new_context(self.browser))
+        except Exception as exc:  # noqa: BLE001
+            print(f"Failed to recycle browser context, pool shrinks to {len(self._entries)}: {exc}")
+
+    def _add(self, context: BrowserContext) -> None:
+        entry = _PooledContext(context=context)
+        self._entries[context] = entry
+        self._available.put_nowait(entry)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import os
+import re
 from dataclasses import dataclass, field
 
 try:
@@ -23,7 +24,7 @@ except ImportError:  # pragma: no cover
         return True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Selectors:
     email: str = 'input[name="email"]'
     password: str = 'input[name="password"]'
@@ -32,7 +33,7 @@ class Selectors:
     error: str = ".error-message, .alert-danger, [role='alert']"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QwenConfig:
     enabled: bool = False
     model_server: str = "http://localhost:11434/v1"
@@ -42,7 +43,7 @@ class QwenConfig:
     enable_thinking: bool = True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentConfig:
     base_url: str
     register_path: str = "/en/user/register"
@@ -51,11 +52,24 @@ class AgentConfig:
     retry_delay_seconds: int = 3
     timeout_ms: int = 30000
     headless: bool = True
+    parallel_attempts: int = 1
+    context_max_uses: int = 1
     locale: str = "en_US"
+    record_video: bool = False
+    screenshot_on_success: bool = False
     video_dir: str = "test_recordings"
     artifact_dir: str = "artifacts"
     selectors: Selectors = field(default_factory=Selectors)
     qwen: QwenConfig = field(default_factory=QwenConfig)
+    register_url: str = field(init=False)
+    dashboard_url_re: re.Pattern[str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Derived values are resolved once here; the instance is frozen afterwards.
+        base_url = self.base_url.rstrip("/")
+        object.__setattr__(self, "base_url", base_url)
+        object.__setattr__(self, "register_url", f"{base_url}{self.register_path}")
+        object.__setattr__(self, "dashboard_url_re", re.compile(self.dashboard_url_pattern))
 
 
 def parse_args() -> argparse.Namespace:
@@ -67,6 +81,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--register-path", default=None, help="Registration page path (overrides env)")
     parser.add_argument("--max-retries", type=int, default=None, help="Max attempts (overrides env)")
     parser.add_argument("--timeout-ms", type=int, default=None, help="Timeout in ms (overrides env)")
+    parser.add_argument("--parallel-attempts", type=int, default=None, help="Concurrent attempts (overrides env)")
     parser.add_argument("--headed", action="store_true", help="Run browser in headed mode")
     return parser.parse_args()
 
@@ -103,7 +118,11 @@ def build_config(args: argparse.Namespace) -> AgentConfig:
         retry_delay_seconds=int(_env_or("RETRY_DELAY_SECONDS", "3")),
         timeout_ms=args.timeout_ms if args.timeout_ms is not None else int(_env_or("TIMEOUT_MS", "30000")),
         headless=not args.headed if args.headed else _parse_bool(_env_or("HEADLESS", "true")),
+        parallel_attempts=args.parallel_attempts if args.parallel_attempts is not None else int(_env_or("PARALLEL_ATTEMPTS", "1")),
+        context_max_uses=int(_env_or("CONTEXT_MAX_USES", "1")),
         locale=_env_or("LOCALE", "en_US"),
+        record_video=_parse_bool(_env_or("RECORD_VIDEO", "false")),
+        screenshot_on_success=_parse_bool(_env_or("SCREENSHOT_ON_SUCCESS", "false")),
         video_dir=_env_or("VIDEO_DIR", "test_recordings"),
         artifact_dir=_env_or("ARTIFACT_DIR", "artifacts"),
         selectors=selectors,
@@ -1,25 +1,39 @@
 from __future__ import annotations
 
+import copy
 import inspect
 import json
+import os
 import re
+from importlib import metadata
 from typing import Any
 
 from tester_agent.config import QwenConfig
-from tester_agent.qwen_tools import BrowserTool
+from tester_agent.qwen_tools import BrowserTool, classify_failure
+from tester_agent.serialization import dumps
 
 
 class QwenThinkingReasoner:
+    # qwen-agent release whose `_chat_complete_create` closure `_share_http_client` mirrors.
+    MIRRORED_QWEN_AGENT_VERSION = "0.0.34"
     SYSTEM_PROMPT = (
         "Ты автономный тестировщик регистрации на сайте. Анализируешь неудачную попытку регистрации и предлагаешь следующее действие. "
         "Можешь вызывать инструмент browser_automation с action=analyze_failure. "
         "Ответ дай в JSON с полями: next_action, should_retry, retry_delay_seconds."
     )
+    FALLBACK_MESSAGES = {
+        "duplicate_email": "Email вероятно уже существует, сгенерировать нового пользователя и повторить.",
+        "timeout": "Похоже на медленный ответ сервера, увеличить ожидание и повторить.",
+        "captcha": "Обнаружена CAPTCHA, нужен обход в тестовой среде или ручная проверка.",
+        "server_error": "Серверная ошибка, повторить позже и сохранить артефакты.",
+    }
+    DEFAULT_FALLBACK_MESSAGE = "Повторить с новыми данными и сохранить больше диагностических артефактов."
 
     def __init__(self, config: QwenConfig):
         self.config = config
         self._assistant = None
         self._assistant_error: str | None = None
+        self._http: Any | None = None
         if self.config.enabled:
             self._assistant = self._build_assistant()
             if self._assistant is None:
@@ -28,6 +42,11 @@ class QwenThinkingReasoner:
                     f"Install `qwen-agent` and check settings. Details: {self._assistant_error}"
                 )
 
+    def close(self) -> None:
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
     async def decide(self, attempt_result: dict[str, Any], attempt: int, max_retries: int) -> dict[str, Any]:
         if not self.config.enabled:
             return self._fallback(attempt_result, attempt, max_retries)
@@ -49,7 +68,7 @@ class QwenThinkingReasoner:
                 "role": "user",
                 "content": (
                     "Проанализируй провал регистрации и предложи следующее действие.\n"
-                    f"Данные: {json.dumps(request_payload, ensure_ascii=False)}"
+                    f"Данные: {dumps(request_payload).decode()}"
                 ),
             }
         ]
@@ -83,11 +102,58 @@ class QwenThinkingReasoner:
             },
         }
 
-        return Assistant(
+        assistant = Assistant(
             llm=llm_cfg,
             function_list=[BrowserTool()],
             system_message=self.SYSTEM_PROMPT,
         )
+        self._share_http_client(assistant)
+        return assistant
+
+    def _share_http_client(self, assistant: Any) -> None:
+        # Qwen-Agent's OpenAI-compatible backend builds a new `openai.OpenAI` client per request;
+        # swap in one bound to a persistent httpx client so retries reuse the connection.
+        llm = getattr(assistant, "llm", None)
+        if llm is None or not hasattr(llm, "_chat_complete_create"):
+            return
+        try:
+            if metadata.version("qwen-agent") != self.MIRRORED_QWEN_AGENT_VERSION:
+                return
+        except metadata.PackageNotFoundError:
+            return
+        try:
+            import httpx
+            import openai
+        except ImportError:
+            return
+
+        try:
+            self._http = httpx.Client(http2=True, timeout=60)
+        except ImportError:  # `h2` is not installed
+            self._http = httpx.Client(timeout=60)
+        # Resolve base URL and key the same way qwen_agent/llm/oai.py does.
+        api_base = (self.config.model_server or "").strip()
+        api_key = (self.config.api_key or os.getenv("OPENAI_API_KEY") or "EMPTY").strip()
+        api_kwargs: dict[str, Any] = {"http_client": self._http}
+        if api_base:
+            api_kwargs["base_url"] = api_base
+        if api_key:
+            api_kwargs["api_key"] = api_key
+        client = openai.OpenAI(**api_kwargs)
+
+        # Same argument handling as the closure in qwen_agent/llm/oai.py (MIRRORED_QWEN_AGENT_VERSION).
+        def _chat_complete_create(*args: Any, **kwargs: Any) -> Any:
+            extra_params = ["top_k", "repetition_penalty"]
+            if any(key in kwargs for key in extra_params):
+                kwargs["extra_body"] = copy.deepcopy(kwargs.get("extra_body", {}))
+                for key in extra_params:
+                    if key in kwargs:
+                        kwargs["extra_body"][key] = kwargs.pop(key)
+            if "request_timeout" in kwargs:
+                kwargs["timeout"] = kwargs.pop("request_timeout")
+            return client.chat.completions.create(*args, **kwargs)
+
+        llm._chat_complete_create = _chat_complete_create
 
     async def _run_assistant(self, messages: list[dict[str, str]]) -> str:
         response = self._assistant.run(messages)
@@ -169,14 +235,7 @@ class QwenThinkingReasoner:
             "source": "heuristic",
         }
 
-    @staticmethod
-    def _fallback_message(reason: str = "") -> str:
-        if "already" in reason or "duplicate" in reason or "существ" in reason:
-            return "Email вероятно уже существует, сгенерировать нового пользователя и повторить."
-        if "timeout" in reason or "timed out" in reason:
-            return "Похоже на медленный ответ сервера, увеличить ожидание и повторить."
-        if "captcha" in reason:
-            return "Обнаружена CAPTCHA, нужен обход в тестовой среде или ручная проверка."
-        if "500" in reason or "502" in reason or "503" in reason:
-            return "Серверная ошибка, повторить позже и сохранить артефакты."
-        return "Повторить с новыми данными и сохранить больше диагностических артефактов."
+    @classmethod
+    def _fallback_message(cls, reason: str = "") -> str:
+        category = classify_failure(reason)
+        return cls.FALLBACK_MESSAGES.get(category, cls.DEFAULT_FALLBACK_MESSAGE)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 
 try:
@@ -8,6 +9,28 @@ except ImportError:  # pragma: no cover
     class BaseTool:  # type: ignore[override]
         pass
 
+FAIL_RE = re.compile(
+    r"(?P<duplicate_email>already|duplicate|существ)"
+    r"|(?P<timeout>timeout|timed out)"
+    r"|(?P<captcha>captcha)"
+    r"|(?P<server_error>50[023])",
+    re.IGNORECASE,
+)
+# Group order in FAIL_RE is the precedence when a reason mentions several categories.
+FAILURE_PRIORITY = tuple(sorted(FAIL_RE.groupindex, key=FAIL_RE.groupindex.__getitem__))
+
+FAILURE_NEXT_ACTIONS = {
+    "duplicate_email": "Generate a new email and retry.",
+    "timeout": "Increase wait and retry after delay.",
+    "captcha": "Requires manual bypass or test environment bypass.",
+    "server_error": "Retry later; backend may be unstable.",
+}
+
+
+def classify_failure(reason: str) -> str | None:
+    found = {match.lastgroup for match in FAIL_RE.finditer(reason)}
+    return next((category for category in FAILURE_PRIORITY if category in found), None)
+
 
 class BrowserTool(BaseTool):
     name = "browser_automation"
@@ -43,14 +66,9 @@ class BrowserTool(BaseTool):
 
         if dashboard_ok:
             return {"category": "post_registration_validation", "next_action": "Retry with same flow and capture extra screenshots."}
-        if "already" in reason or "duplicate" in reason or "существ" in reason:
-            return {"category": "duplicate_email", "next_action": "Generate a new email and retry."}
-        if "timeout" in reason or "timed out" in reason:
-            return {"category": "timeout", "next_action": "Increase wait and retry after delay."}
-        if "captcha" in reason:
-            return {"category": "captcha", "next_action": "Requires manual bypass or test environment bypass."}
-        if "500" in reason or "502" in reason or "503" in reason:
-            return {"category": "server_error", "next_action": "Retry later; backend may be unstable."}
+        category = classify_failure(reason)
+        if category is not None:
+            return {"category": category, "next_action": FAILURE_NEXT_ACTIONS[category]}
         if attempt >= max_retries:
             return {"category": "max_retries_reached", "next_action": "Stop retries and escalate with report artifacts."}
         return {"category": "unknown", "next_action": "Retry with fresh test data and keep collecting artifacts."}
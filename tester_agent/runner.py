@@ -1,20 +1,22 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from tester_agent.artifacts import ArtifactWriter, write_file
 from tester_agent.browser_flow import BrowserRegistrationFlow
 from tester_agent.config import AgentConfig
 from tester_agent.qwen_reasoner import QwenThinkingReasoner
+from tester_agent.serialization import dumps
 
 
 class RegistrationTestRunner:
     def __init__(self, config: AgentConfig):
         self.config = config
-        self.browser_flow = BrowserRegistrationFlow(config)
+        self.writer = ArtifactWriter()
+        self.browser_flow = BrowserRegistrationFlow(config, writer=self.writer)
         self.reasoner = QwenThinkingReasoner(config.qwen)
         self.artifact_dir = Path(config.artifact_dir)
         self.artifact_dir.mkdir(parents=True, exist_ok=True)
@@ -25,25 +27,42 @@ class RegistrationTestRunner:
             "test_id": test_id,
             "start_time": datetime.now().isoformat(timespec="seconds"),
             "base_url": self.config.base_url,
-            "register_url": self.browser_flow.register_url(),
+            "register_url": self.config.register_url,
             "max_retries": self.config.max_retries,
             "qwen_enabled": self.config.qwen.enabled,
             "attempts": [],
             "status": "failed",
         }
 
-        for attempt in range(1, self.config.max_retries + 1):
-            print(f"[Attempt {attempt}/{self.config.max_retries}] Starting registration flow")
-            user_data = self.browser_flow.generate_user_data()
-            attempt_result = await self.browser_flow.run_attempt(test_id, attempt, user_data)
-            report["attempts"].append(attempt_result)
+        async with self.writer:
+            try:
+                async with self.browser_flow:
+                    await self._run_attempts(test_id, report)
+            finally:
+                self.reasoner.close()
 
-            if attempt_result.get("success"):
+        report["end_time"] = datetime.now().isoformat(timespec="seconds")
+        report_path = self.artifact_dir / f"{test_id}_report.json"
+        await asyncio.to_thread(write_file, report_path, dumps(report, indent=True))
+        print(f"Report saved: {report_path}")
+        return report
+
+    async def _run_attempts(self, test_id: str, report: dict[str, Any]) -> None:
+        attempt = 0
+        while attempt < self.config.max_retries:
+            last_attempt = min(attempt + max(1, self.config.parallel_attempts), self.config.max_retries)
+            batch_results = await self._run_batch(test_id, range(attempt + 1, last_attempt + 1))
+            report["attempts"].extend(batch_results)
+            attempt = last_attempt
+
+            winner = next((item for item in batch_results if item.get("success")), None)
+            if winner is not None:
                 report["status"] = "success"
-                report["successful_attempt"] = attempt
+                report["successful_attempt"] = winner["attempt"]
                 break
 
             if attempt < self.config.max_retries:
+                attempt_result = batch_results[-1]
                 decision = await self.reasoner.decide(attempt_result, attempt, self.config.max_retries)
                 attempt_result["next_action"] = decision.get("next_action")
                 attempt_result["next_action_source"] = decision.get("source")
@@ -56,11 +75,48 @@ class RegistrationTestRunner:
                 else:
                     break
 
-        report["end_time"] = datetime.now().isoformat(timespec="seconds")
-        report_path = self.artifact_dir / f"{test_id}_report.json"
-        report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
-        print(f"Report saved: {report_path}")
-        return report
+    async def _run_batch(self, test_id: str, attempts: range) -> list[dict[str, Any]]:
+        tasks: list[asyncio.Task[dict[str, Any]]] = []
+        started: dict[asyncio.Task[dict[str, Any]], tuple[int, dict[str, str]]] = {}
+        for attempt in attempts:
+            print(f"[Attempt {attempt}/{self.config.max_retries}] Starting registration flow")
+            user_data = self.browser_flow.generate_user_data()
+            task = asyncio.create_task(self.browser_flow.run_attempt(test_id, attempt, user_data))
+            tasks.append(task)
+            started[task] = (attempt, user_data)
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(self._task_succeeded(task) for task in done):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [self._task_result(task, *started[task]) for task in tasks]
+
+    @staticmethod
+    def _task_succeeded(task: asyncio.Task[dict[str, Any]]) -> bool:
+        return not task.cancelled() and task.exception() is None and bool(task.result().get("success"))
+
+    @staticmethod
+    def _task_result(task: asyncio.Task[dict[str, Any]], attempt: int, user_data: dict[str, str]) -> dict[str, Any]:
+        if task.cancelled():
+            reason = "cancelled"
+        elif task.exception() is not None:
+            reason = f"Unhandled error: {task.exception()}"
+        else:
+            return task.result()
+        return {
+            "attempt": attempt,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "user_data": {"email": user_data["email"], "name": user_data["name"]},
+            "success": False,
+            "reason": reason,
+        }
 
     @staticmethod
     def _build_test_id() -> str: